@@ -27,6 +27,7 @@ from .constants import (
     LOG_LEVEL,
     DEFAULT_LISTEN_PORT,
     DEFAULT_LISTEN_HOST,
+    DEFAULT_LISTEN_RCVBUF,
     DEFAULT_COT_TYPE,
     DEFAULT_COT_STALE,
     DEFAULT_POLL_INTERVAL,
@@ -34,8 +35,13 @@ from .constants import (
     DEFAULT_SHIP_DB_FILE,
 )
 
-from .functions import ais_to_cot, create_tasks
+from .functions import ais_to_cot, ais_to_cot_batch, cot_config, create_tasks
 
-from .ais_functions import get_known_craft
+from .ais_functions import (
+    classify_mmsi,
+    get_known_craft,
+    index_known_craft,
+    load_known_craft,
+)
 
 from .classes import AISWorker
@@ -18,8 +18,14 @@
 
 """AISCOT Functions."""
 
-from csv import DictReader
-from typing import TextIO
+import csv
+import mmap
+import os
+
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import TextIO, Tuple, Union
 
 import aiscot
 
@@ -36,7 +42,7 @@ def read_known_craft_fd(csv_fd: TextIO) -> list:
     All Known Craft transforms.
     """
     all_rows: list = []
-    reader = DictReader(csv_fd)
+    reader = csv.DictReader(csv_fd)
     for row in reader:
         all_rows.append(row)
     return all_rows
@@ -59,38 +65,210 @@ def get_known_craft(csv_file: str) -> list:
     return all_rows
 
 
+def index_known_craft(known_craft_db: list, key: str = "MMSI") -> dict:
+    """Index Known Craft transforms by their normalized (stripped, upper-case) key.
+
+    Parameters
+    ----------
+    known_craft_db : All Known Craft transforms, as from `get_known_craft()`.
+    key : The Known Craft field to index by.
+
+    Returns
+    -------
+    Known Craft transforms keyed by `key`. The first transform for a given key wins.
+    """
+    index: dict = {}
+    for row in known_craft_db:
+        craft_key = (row.get(key) or "").strip().upper()
+        if craft_key:
+            index.setdefault(craft_key, row)
+    return index
+
+
+def load_known_craft(csv_file: str) -> Tuple[list, dict]:
+    """Read & index an AISCOT Known Craft file, reusing it until the file changes.
+
+    Parameters
+    ----------
+    csv_file : The path to the Known Craft file.
+
+    Returns
+    -------
+    All Known Craft transforms, as from `get_known_craft()`, and their MMSI index, as
+    from `index_known_craft()`. Both are shared, and must not be modified.
+    """
+    return _load_known_craft(csv_file, os.stat(csv_file).st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_known_craft(
+    csv_file: str, mtime_ns: int  # pylint: disable=unused-argument
+) -> Tuple[list, dict]:
+    """Read & index a Known Craft file, cached by path & modification time."""
+    known_craft_db: list = get_known_craft(csv_file)
+    return known_craft_db, index_known_craft(known_craft_db)
+
+
 def read_mid_db_file(csv_file: str = "") -> dict:
     """Read the MID_DB_FILE file into a `dict`."""
     csv_file = csv_file or aiscot.DEFAULT_MID_DB_FILE
-    mid_digits: list = []
-    mid_allocated_to: list = []
-
     with open(csv_file, encoding="UTF-8") as csv_fd:
-        reader = DictReader(csv_fd)
-        for row in reader:
-            mid_digits.append(row["Digit"])
-            mid_allocated_to.append(row["Allocated to"])
+        reader = csv.reader(csv_fd)
+        header: list = next(reader, [])
+        digit = header.index("Digit")
+        allocated_to = header.index("Allocated to")
+        return {row[digit]: row[allocated_to] for row in reader if row}
 
-    return dict(zip(mid_digits, mid_allocated_to))
 
+def read_ship_db_file(csv_file: str = "") -> dict:
+    """Read the SHIP_DB_FILE file into a MMSI -> Ship Name `dict`.
 
-def read_ship_db_file(csv_file: str = "") -> list:
-    """Read the SHIP_DB_FILE file into a `list`."""
+    The SHIP_DB_FILE columns are: MMSI, Ship Name, Call Sign & Vessel Type. Only the
+    first two are kept. Entries are read through `read_ship_db_index()`, so as with
+    `get_shipname()`, only numeric MMSIs are kept and the first entry wins.
+    """
+    ship_db, _, offsets = read_ship_db_index(csv_file)
+    try:
+        return _ship_db_names(ship_db, offsets)
+    finally:
+        if isinstance(ship_db, mmap.mmap):
+            ship_db.close()
+
+
+def read_ship_db_index(
+    csv_file: str = "",
+) -> Tuple[Union[mmap.mmap, bytes], array, array]:
+    """Memory-map the SHIP_DB_FILE and index its lines by MMSI.
+
+    Only the sorted MMSIs & the offsets of their lines are held in memory; the Ship
+    Names are read from the read-only mapping, which is shared by every AISCOT
+    process on the host through the page cache. The first entry for a given MMSI
+    wins, as with `read_ship_db_file()`.
+    """
     csv_file = csv_file or aiscot.DEFAULT_SHIP_DB_FILE
-    all_rows: list = []
-    fields: list = ["MMSI", "name", "unk", "vtype"]
-    with open(csv_file, "r", encoding="ISO-8859-1") as csv_fd:
-        reader = DictReader(csv_fd, fields)
-        for row in reader:
-            all_rows.append(row)
-        return all_rows
+    with open(csv_file, "rb") as csv_fd:
+        try:
+            ship_db = mmap.mmap(csv_fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Can't map an empty file.
+            return b"", array("Q"), array("Q")
+
+    entries: dict = {}
+    offset: int = 0
+    for line in iter(ship_db.readline, b""):
+        mmsi, sep, _ = line.partition(b",")
+        if sep and mmsi.isdigit():
+            entries.setdefault(int(mmsi), offset)
+        offset += len(line)
+
+    mmsis: array = array("Q", sorted(entries))
+    return ship_db, mmsis, array("Q", [entries[mmsi] for mmsi in mmsis])
+
+
+def _read_ship_db_row(ship_db: Union[mmap.mmap, bytes], offset: int) -> list:
+    """Read the SHIP_DB_FILE row at `offset` of its mapping."""
+    end: int = ship_db.find(b"\n", offset)
+    line: str = ship_db[offset : end if end != -1 else len(ship_db)].decode(
+        "ISO-8859-1"
+    )
+    return next(csv.reader([line]))
+
+
+def _ship_db_names(ship_db: Union[mmap.mmap, bytes], offsets: array) -> dict:
+    """Get the MMSI -> Ship Name `dict` of an indexed SHIP_DB_FILE."""
+    rows = (_read_ship_db_row(ship_db, offset) for offset in offsets)
+    return {row[0]: row[1] for row in rows if len(row) > 1}
+
+
+@lru_cache(maxsize=None)
+def _mid_db() -> dict:
+    """Get MID_DB, reading the MID_DB_FILE on first use."""
+    return read_mid_db_file()
+
 
+@lru_cache(maxsize=None)
+def _mid_db_int() -> dict:
+    """Get MID_DB_INT, the MID -> Country index of MID_DB keyed by integer MID."""
+    return {int(mid): country for mid, country in _mid_db().items() if mid.isdigit()}
 
-MID_DB = read_mid_db_file()
-SHIP_DB = read_ship_db_file()
 
+@lru_cache(maxsize=None)
+def _ship_db() -> dict:
+    """Get SHIP_DB, built from the same index as `get_shipname()` lookups."""
+    ship_db, _, offsets = _ship_db_index()
+    return _ship_db_names(ship_db, offsets)
 
-def get_mid(mmsi: str) -> str:
+
+@lru_cache(maxsize=None)
+def _ship_db_index() -> Tuple[Union[mmap.mmap, bytes], array, array]:
+    """Get the SHIP_DB_FILE index, mapping the SHIP_DB_FILE on first use."""
+    return read_ship_db_index()
+
+
+# The MID & Ship databases are only read when first needed, rather than on import:
+_LAZY_DBS: dict = {"MID_DB": _mid_db, "MID_DB_INT": _mid_db_int, "SHIP_DB": _ship_db}
+
+
+def __getattr__(name: str):
+    """Get the lazily-read MID_DB, MID_DB_INT & SHIP_DB module attributes."""
+    if name in _LAZY_DBS:
+        return _LAZY_DBS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Craft report many times per session, so per-MMSI lookups are memoized for up to
+# this many MMSIs:
+MMSI_CACHE_SIZE: int = 65536
+
+# US Coast Guard SAR MMSI prefixes (leading five digits).
+_USCG_SAR_PREFIXES = frozenset({30386, 33885})
+
+
+def _mmsi_int(mmsi: Union[int, str]) -> int:
+    """Coerce an MMSI to an `int`, returning 0 if it is not numeric."""
+    if isinstance(mmsi, int):
+        return mmsi
+    try:
+        return int(mmsi)
+    except (TypeError, ValueError):
+        return 0
+
+
+@lru_cache(maxsize=MMSI_CACHE_SIZE)
+def classify_mmsi(mmsi: Union[int, str]) -> Tuple[str, bool, bool, bool]:
+    """Classify a given MMSI in a single pass.
+
+    Parameters
+    ----------
+    mmsi : MMSI as decoded from AIS data.
+
+    Returns
+    -------
+    A tuple of the MMSI's MID country (see `get_mid()`), and its AtoN, SAR & CRS
+    status (see `get_aton()`, `get_sar()` & `get_crs()`).
+    """
+    _mmsi: int = _mmsi_int(mmsi)
+
+    # Ship station MMSIs are nine digits, with the MID in the leading three:
+    if 100_000_000 <= _mmsi < 1_000_000_000:
+        country: str = _mid_db_int().get(_mmsi // 1_000_000)
+        sar: bool = _mmsi // 1_000_000 == 111 or _mmsi // 10_000 in _USCG_SAR_PREFIXES
+    else:
+        country = _mid_db().get(str(mmsi)[:3])
+        sar = False
+
+    aton: bool = 990_000_000 <= _mmsi < 1_000_000_000
+
+    # Known CRS:
+    # 3669145
+    # 3669708
+    # 3669709
+    # ...and 003369XXX, which loses its leading zeros as an int.
+    crs: bool = 3_669_000 <= _mmsi < 3_670_000 or 3_369_000 <= _mmsi < 3_370_000
+
+    return country, aton, sar, crs
+
+
+def get_mid(mmsi: Union[int, str]) -> str:
     """Get the registered country for a given vessel's MMSI MID.
 
     Uses the ITU MID Database.
@@ -105,12 +283,10 @@ def get_mid(mmsi: str) -> str:
     -------
     Country name in the MID Database from ITU.
     """
-    mid: str = str(mmsi)[:3]
-    country: str = MID_DB.get(mid)
-    return country
+    return classify_mmsi(mmsi)[0]
 
 
-def get_aton(mmsi: str) -> bool:
+def get_aton(mmsi: Union[int, str]) -> bool:
     """Get the AIS Aids-to-Navigation (AtoN) status of a given MMSI.
 
     AIS Aids to Navigation (AtoN):
@@ -120,13 +296,13 @@ def get_aton(mmsi: str) -> bool:
         federal government.
         Src: https://www.navcen.uscg.gov/?pageName=mtmmsi
 
-    :param mmsi: str MMSI as decoded from AIS data.
+    :param mmsi: int or str MMSI as decoded from AIS data.
     :return: bool True if MMSI belongs to an AtoN, otherwise False.
     """
-    return str(mmsi)[:2] == "99"
+    return classify_mmsi(mmsi)[1]
 
 
-def get_sar(mmsi: str) -> bool:
+def get_sar(mmsi: Union[int, str]) -> bool:
     """Get the AIS Search-And-Rescue (SAR) status of a given MMSI.
 
     Search and Rescue Aircraft:
@@ -136,48 +312,42 @@ def get_sar(mmsi: str) -> bool:
         currently only used by the U.S. Coast Guard.
         Src: https://www.navcen.uscg.gov/?pageName=mtmmsi
 
-    :param mmsi: str MMSI as decoded from AIS data.
-    :return:
+    :param mmsi: int or str MMSI as decoded from AIS data.
+    :return: bool True if MMSI belongs to a SAR craft, otherwise False.
     """
-    sar = False
-    _mmsi = str(mmsi)
-    if _mmsi[:3] == "111":
-        sar = True
-    elif _mmsi[:5] in ["30386", "33885"]:  # US Coast Guard
-        sar = True
-    return sar
+    return classify_mmsi(mmsi)[2]
 
 
-def get_crs(mmsi: str) -> bool:
+def get_crs(mmsi: Union[int, str]) -> bool:
     """Get the CRS status of the vessel based on MMSI.
 
     :param mmsi: MMSI of the vessel.
-    :type mmsi: str
+    :type mmsi: int or str
     :returns: True if CRS, False otherwise.
     :rtype: bool
     """
-    crs = False
-    # Known CRS:
-    # 3669145
-    # 3669708
-    # 3669709
-    if str(mmsi)[:4] == "3669" and len(str(mmsi)) == 7:
-        crs = True
-    elif str(mmsi)[:6] == "003369":
-        crs = True
-    return crs
+    return classify_mmsi(mmsi)[3]
 
 
+@lru_cache(maxsize=MMSI_CACHE_SIZE)
 def get_shipname(mmsi: str) -> str:
     """Get the ship name from the Ship DB based on the MMSI.
 
     :param mmsi: MMSI of the ship.
     :returns: Ship name.
     """
-    ship_name: str = ""
-    # TODO: Optimize this search:
-    for ship in SHIP_DB:
-        if str(ship.get("MMSI")) == str(mmsi):
-            ship_name = ship.get("name")
-            break
-    return ship_name
+    mmsi = str(mmsi)
+    if not mmsi.isdigit():
+        return ""
+
+    ship_db, mmsis, offsets = _ship_db_index()
+    _mmsi: int = int(mmsi)
+    idx: int = bisect_left(mmsis, _mmsi)
+    if idx == len(mmsis) or mmsis[idx] != _mmsi:
+        return ""
+
+    row: list = _read_ship_db_row(ship_db, offsets[idx])
+    # The index is by numeric MMSI, so make sure this is the same MMSI string:
+    if row[0] != mmsi:
+        return ""
+    return row[1]
@@ -20,7 +20,10 @@
 """AISCOT Class Definitions."""
 
 import asyncio
+import json
 import logging
+import socket
+import sys
 import warnings
 
 from configparser import ConfigParser
@@ -32,6 +35,25 @@ import pytak
 import aiscot
 import aiscot.pyAISm
 
+# orjson is optional, and much faster than json for large AIS feed responses:
+try:
+    import orjson  # type: ignore
+
+    json_loads = orjson.loads  # pylint: disable=no-member
+except ImportError:
+    json_loads = json.loads
+
+# Raised by `aiscot.pyAISm.decod_ais()` for malformed or corrupt AIS sentences:
+_DECODE_ERRORS = (
+    aiscot.pyAISm.BadChecksumError,
+    aiscot.pyAISm.UnrecognizedNMEAMessageError,
+    IndexError,
+    ValueError,
+)
+
+# Linux's SO_BUSY_POLL, which isn't exported by Python's socket module:
+SO_BUSY_POLL: int = getattr(socket, "SO_BUSY_POLL", 46)
+
 
 # pylint: disable=too-many-instance-attributes
 class AISNetworkClient(asyncio.Protocol):
@@ -47,13 +69,18 @@ class AISNetworkClient(asyncio.Protocol):
         _logger.propagate = False
     logging.getLogger("asyncio").setLevel(aiscot.LOG_LEVEL)
 
+    # Maximum number of datagrams received per `read_ready()` call:
+    recv_batch_size: int = 64
+
     def __init__(self, ready, queue, config) -> None:
         """Initialize this class."""
         self.transport = None
         self.address = None
         self.known_craft_db = None
+        self.known_craft_index: dict = {}
 
         self.ready = ready
+        self.closed = asyncio.Event()
         self.queue = queue
         self.config = config
 
@@ -61,43 +88,64 @@ class AISNetworkClient(asyncio.Protocol):
             for handler in self._logger.handlers:
                 handler.setLevel(logging.DEBUG)
 
+        # Checked once here, rather than for every message in the hot path:
+        self._debug: bool = self._logger.isEnabledFor(logging.DEBUG)
+        self._include_all_craft: bool = self.config.getboolean(
+            "INCLUDE_ALL_CRAFT", False
+        )
+        self._cot_config: dict = aiscot.cot_config(self.config)
+
+        # Reusable receive buffer for `read_ready()`, sized for the largest datagram:
+        self._buffer = bytearray(65535)
+        self._view = memoryview(self._buffer)
+
+        known_craft = self.config.get("KNOWN_CRAFT")
+        if known_craft:
+            self._logger.info("Using KNOWN_CRAFT: %s", known_craft)
+            self.known_craft_db, self.known_craft_index = aiscot.load_known_craft(
+                known_craft
+            )
+
     def handle_message(self, data) -> None:
         """Handle incoming AIS data from network."""
-        d_data = data.decode().strip()
-        msg: dict = aiscot.pyAISm.decod_ais(d_data)
+        self.handle_messages([data.decode()])
 
-        self._logger.debug("Decoded AIS: '%s'", msg)
+    def handle_messages(self, lines: List[str]) -> None:
+        """Handle a batch of incoming AIS sentences, such as from one datagram.
 
-        mmsi = str(msg.get("mmsi", ""))
+        The sentences are rendered to CoT as one batch, sharing their timestamps.
+        """
+        decod_ais = aiscot.pyAISm.decod_ais
+        msgs: List[dict] = []
 
-        known_craft: dict = {}
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
 
-        if self.known_craft_db:
-            known_craft = (
-                list(
-                    filter(
-                        lambda x: x["MMSI"].strip().upper() == mmsi,
-                        self.known_craft_db,
-                    )
-                )
-                or [{}]
-            )[0]
-            # self._logger.debug("known_craft='%s'", known_craft)
-
-        # Skip if we're using known_craft CSV and this Craft isn't found:
-        if (
-            self.known_craft_db
-            and not known_craft
-            and not self.config.getboolean("INCLUDE_ALL_CRAFT")
-        ):
-            return
+            try:
+                msg: dict = decod_ais(line)
+            except _DECODE_ERRORS as exc:
+                # Skip just this sentence, not the rest of the batch:
+                self._logger.warning("Unable to decode AIS '%s': %r", line, exc)
+                continue
 
-        event: Optional[bytes] = aiscot.ais_to_cot(
-            msg, config=self.config, known_craft=known_craft
-        )
+            if self._debug:
+                self._logger.debug("Decoded AIS: '%s'", msg)
+            msgs.append(msg)
+
+        if not msgs:
+            return
 
-        if event:
-            self.queue.put_nowait(event)
+        put_event = self.queue.put_nowait
+        for event in aiscot.ais_to_cot_batch(
+            msgs,
+            self._cot_config,
+            self.known_craft_index,
+            # Skip craft not in the known_craft CSV, if we're using one:
+            not self._include_all_craft,
+        ):
+            put_event(event)
 
     def connection_made(self, transport) -> None:
         """Call when a network connection is made."""
@@ -105,22 +153,43 @@ class AISNetworkClient(asyncio.Protocol):
         self.address = transport.get_extra_info("peername")
         self.address = self.address or "peer (no peername available)."
         self._logger.info("Connection from %s", self.address)
-
-        known_craft = self.config.get("KNOWN_CRAFT")
-        if known_craft:
-            self._logger.info("Using KNOWN_CRAFT: %s", known_craft)
-            self.known_craft_db = aiscot.get_known_craft(known_craft)
         self.ready.set()
 
+    def read_ready(self, sock: socket.socket) -> None:
+        """Call when the AIS socket is readable, receives into the reusable buffer.
+
+        Drains up to `recv_batch_size` queued datagrams per call, and handles all of
+        their AIS sentences as one batch.
+        """
+        lines: List[str] = []
+        for _ in range(self.recv_batch_size):
+            try:
+                nbytes, addr = sock.recvfrom_into(self._buffer)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                self.error_received(exc)
+                break
+            data = self._view[:nbytes]
+            if self._debug:
+                self._logger.debug("Recieved from %s: '%s'", addr, bytes(data))
+            lines.extend(str(data, "ascii", "replace").splitlines())
+        self.handle_messages(lines)
+
     def datagram_received(self, data, addr) -> None:
         """Call when a UDP datagram is received."""
-        self._logger.debug("Recieved from %s: '%s'", addr, data)
-        for line in data.splitlines():
-            self.handle_message(line)
+        if self._debug:
+            self._logger.debug("Recieved from %s: '%s'", addr, bytes(data))
+        self.handle_messages(str(data, "ascii", "replace").splitlines())
+
+    def error_received(self, exc) -> None:
+        """Call when a UDP send or receive operation fails."""
+        self._logger.warning("Error receiving AIS: %s", exc)
 
     def connection_lost(self, exc) -> None:
         """Call when a network connection is lost."""
         self.ready.clear()
+        self.closed.set()
         self._logger.exception(exc)
         self._logger.warning("Disconnected from %s", self.address)
 
@@ -128,52 +197,45 @@ class AISNetworkClient(asyncio.Protocol):
 class AISWorker(pytak.QueueWorker):
     """AIS to TAK worker."""
 
+    # Number of feed craft rendered between yields to the event loop:
+    feed_batch_size: int = 100
+
     def __init__(self, queue: asyncio.Queue, config: ConfigParser) -> None:
         """Initialize an instance of this class."""
         super().__init__(queue, config)
-        _ = [x.setFormatter(aiscot.LOG_FORMAT) for x in self._logger.handlers]
+        for handler in self._logger.handlers:
+            handler.setFormatter(aiscot.LOG_FORMAT)
         self.known_craft_db: List[Any] = []
+        self.known_craft_index: dict = {}
         self.session: Optional[aiohttp.ClientSession] = None
         self.feed_url: Optional[str] = None
+        # Ships & validators from the last feed response, for conditional GETs:
+        self._feed_ships: list = []
+        self._feed_validators: dict = {}
+        # Read once here, rather than on every feed poll:
+        self._include_all_craft: bool = self.config.getboolean(
+            "INCLUDE_ALL_CRAFT", False
+        )
+        self._cot_config: dict = aiscot.cot_config(self.config)
 
     async def handle_data(self, data) -> None:
-        """Handle received data."""
-        # self._logger.info("Received AIS: '%s'", msg)
-        mmsi: str = ""
-
-        for msg in data:
-            mmsi = str(msg.get("MMSI", msg.get("mmsi", "")))
-            if not mmsi:
-                continue
-
-            known_craft: dict = {}
+        """Handle received data, rendering a whole feed response as one batch."""
+        # Skip craft not in the known_craft CSV, if we're using one:
+        skip_unknown: bool = (
+            bool(self.known_craft_index) and not self._include_all_craft
+        )
 
-            if self.known_craft_db:
-                known_craft = (
-                    list(
-                        filter(
-                            lambda x: x["MMSI"].strip().upper() == mmsi,
-                            self.known_craft_db,
-                        )
-                    )
-                    or [{}]
-                )[0]
-                # self._logger.debug("known_craft='%s'", known_craft)
-
-            # Skip if we're using known_craft CSV and this Craft isn't found:
-            if (
-                self.known_craft_db
-                and not known_craft
-                and not self.config.getboolean("INCLUDE_ALL_CRAFT")
+        # Large feed responses are rendered a slice at a time, yielding in between so
+        # the TX worker can send while we work through the rest:
+        for start in range(0, len(data), self.feed_batch_size):
+            for event in aiscot.ais_to_cot_batch(
+                data[start : start + self.feed_batch_size],
+                self._cot_config,
+                self.known_craft_index,
+                skip_unknown,
             ):
-                continue
-
-            event: Optional[bytes] = aiscot.ais_to_cot(
-                msg, self.config, known_craft=known_craft
-            )
-
-            if event:
                 await self.put_queue(event)
+            await asyncio.sleep(0)
 
     async def get_feed(self) -> None:
         """Get AIS data from AISHub feed."""
@@ -182,33 +244,54 @@ class AISWorker(pytak.QueueWorker):
         if not self.feed_url:
             raise ValueError("Feed URL is not set.")
 
-        if "seavision" in self.feed_url:
+        # Ask the feed to skip the response if nothing has changed since last poll:
+        headers: dict = {}
+        if "ETag" in self._feed_validators:
+            headers["If-None-Match"] = self._feed_validators["ETag"]
+        if "Last-Modified" in self._feed_validators:
+            headers["If-Modified-Since"] = self._feed_validators["Last-Modified"]
+
+        seavision: bool = "seavision" in self.feed_url
+        if seavision:
             self._logger.info("Using SeaVision API")
-            headers = {
-                "x-api-key": self.config.get("SEAVISION_API_KEY"),
-                "accept": "application/json",
-            }
-            response = await self.session.request(
-                method="GET", url=self.feed_url, headers=headers
-            )
-            response.raise_for_status()
-            json_resp = await response.json()
-            if json_resp:
-                self._logger.debug("Retrieved %s ships", len(json_resp))
-                await self.handle_data(json_resp)
-        else:
-            response = await self.session.request(method="GET", url=self.feed_url)
-            response.raise_for_status()
-            json_resp = await response.json()
+            headers["x-api-key"] = self.config.get("SEAVISION_API_KEY")
+            headers["accept"] = "application/json"
+
+        response = await self.session.request(
+            method="GET", url=self.feed_url, headers=headers
+        )
 
+        if response.status == 304:
+            # Unchanged, so re-send the last poll's ships without re-parsing them:
+            self._logger.debug("Feed not modified since last poll.")
+            response.release()
+            await self.handle_data(self._feed_ships)
+            return
+
+        # Parse the raw body, rather than having aiohttp decode it to str first:
+        json_resp = json_loads(await response.read())
+
+        if seavision:
+            ships = json_resp
+        else:
             api_report = json_resp[0]
             if api_report.get("ERROR"):
                 self._logger.error("AISHub.com API returned an error: ")
                 self._logger.error(api_report)
-            else:
-                ships = json_resp[1]
-                self._logger.debug("Retrieved %s ships", len(ships))
-                await self.handle_data(ships)
+                self._feed_validators = {}
+                return
+            ships = json_resp[1]
+
+        self._feed_ships = ships or []
+        self._feed_validators = {
+            key: response.headers[key]
+            for key in ("ETag", "Last-Modified")
+            if key in response.headers
+        }
+
+        if ships:
+            self._logger.debug("Retrieved %s ships", len(ships))
+            await self.handle_data(ships)
 
     async def run(self, number_of_iterations=-1) -> None:
         """Run this Thread, reads AIS & outputs CoT."""
@@ -217,7 +300,9 @@ class AISWorker(pytak.QueueWorker):
         known_craft = self.config.get("KNOWN_CRAFT")
         if known_craft:
             self._logger.info("Using KNOWN_CRAFT: %s", known_craft)
-            self.known_craft_db = aiscot.get_known_craft(known_craft)
+            self.known_craft_db, self.known_craft_index = aiscot.load_known_craft(
+                known_craft
+            )
 
         self.feed_url = self.config.get("FEED_URL")
         self._logger.info("Using FEED_URL: %s", self.feed_url)
@@ -231,23 +316,119 @@ class AISWorker(pytak.QueueWorker):
         port: int = int(self.config.get("LISTEN_PORT", aiscot.DEFAULT_LISTEN_PORT))
         host: str = self.config.get("LISTEN_HOST", aiscot.DEFAULT_LISTEN_HOST)
 
+        reuse_port: bool = self.config.getboolean("LISTEN_REUSE_PORT", False)
+        busy_poll: int = int(self.config.get("LISTEN_BUSY_POLL", 0))
+        rcvbuf: int = int(
+            self.config.get("LISTEN_RCVBUF", aiscot.DEFAULT_LISTEN_RCVBUF)
+        )
+
         loop = asyncio.get_event_loop()
         ready = asyncio.Event()
+        client = AISNetworkClient(ready, self.queue, self.config)
+        sock = self.listen_socket(host, port, reuse_port, busy_poll, rcvbuf)
         self._logger.info("Listening for AIS on %s:%s", host, port)
-        await loop.create_datagram_endpoint(
-            lambda: AISNetworkClient(ready, self.queue, self.config),
-            local_addr=(host, port),
-        )
-        await ready.wait()
-        while 1:
-            await asyncio.sleep(0.01)
+        try:
+            loop.add_reader(sock.fileno(), client.read_ready, sock)
+        except NotImplementedError:
+            # Event loops without add_reader(), such as Windows' Proactor, receive
+            # via a datagram endpoint instead:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: client, sock=sock
+            )
+            try:
+                await ready.wait()
+                await client.closed.wait()
+            finally:
+                transport.close()
+            return
+
+        try:
+            # Datagrams are handled by `client.read_ready()` until we're cancelled:
+            await client.closed.wait()
+        finally:
+            loop.remove_reader(sock.fileno())
+            sock.close()
+
+    # pylint: disable=too-many-arguments
+    def listen_socket(
+        self,
+        host: str,
+        port: int,
+        reuse_port: bool,
+        busy_poll: int = 0,
+        rcvbuf: int = 0,
+    ) -> socket.socket:
+        """Create a non-blocking UDP socket bound to the given AIS listen address."""
+        family, sock_type, proto, _, addr = socket.getaddrinfo(
+            host, port, type=socket.SOCK_DGRAM
+        )[0]
+        sock = socket.socket(family, sock_type, proto)
+        try:
+            if reuse_port:
+                if hasattr(socket, "SO_REUSEPORT"):
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                else:
+                    self._logger.warning(
+                        "LISTEN_REUSE_PORT is not supported on this platform."
+                    )
+            if busy_poll:
+                self.set_busy_poll(sock, busy_poll)
+            if rcvbuf:
+                self.set_rcvbuf(sock, rcvbuf)
+            sock.bind(addr)
+            sock.setblocking(False)
+        except BaseException:
+            # Don't leak the socket if the LISTEN_HOST/PORT is bad or in use:
+            sock.close()
+            raise
+        return sock
+
+    def set_rcvbuf(self, sock: socket.socket, rcvbuf: int) -> None:
+        """Size the socket's receive buffer, so bursts of AIS aren't dropped."""
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+        except OSError as exc:
+            # macOS & BSD refuse sizes above kern.ipc.maxsockbuf, rather than capping:
+            self._logger.warning("Unable to set LISTEN_RCVBUF: %s", exc)
+            return
+        applied: int = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        # N.B. Linux reports double the size requested, to account for its overhead.
+        if sys.platform.startswith("linux"):
+            applied //= 2
+        if applied < rcvbuf:
+            self._logger.warning(
+                "LISTEN_RCVBUF of %s bytes was capped to %s bytes by the OS, "
+                "consider raising net.core.rmem_max",
+                rcvbuf,
+                applied,
+            )
+        else:
+            self._logger.debug("LISTEN_RCVBUF: %s bytes", applied)
+
+    def set_busy_poll(self, sock: socket.socket, busy_poll: int) -> None:
+        """Busy poll the NIC for up to `busy_poll` microseconds on socket reads."""
+        if not sys.platform.startswith("linux"):
+            self._logger.warning("LISTEN_BUSY_POLL is only supported on Linux.")
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, busy_poll)
+        except OSError as exc:
+            # Raising the busy poll time above net.core.busy_read needs CAP_NET_ADMIN
+            self._logger.warning("Unable to set LISTEN_BUSY_POLL: %s", exc)
 
     async def poll_feed(self) -> None:
         """Poll the data source feed."""
         poll_interval: int = int(
             self.config.get("POLL_INTERVAL", aiscot.DEFAULT_POLL_INTERVAL)
         )
-        async with aiohttp.ClientSession() as self.session:
+        # Keep the connection to the feed open between polls, rather than
+        # reconnecting (and TLS handshaking) every POLL_INTERVAL:
+        connector = aiohttp.TCPConnector(
+            limit=1, keepalive_timeout=poll_interval * 2, enable_cleanup_closed=True
+        )
+        async with aiohttp.ClientSession(
+            connector=connector, raise_for_status=True
+        ) as self.session:
             while 1:
                 self._logger.info("Polling every %ss: %s", poll_interval, self.feed_url)
                 await self.get_feed()
@@ -19,11 +19,21 @@
 
 """AISCOT Command Line."""
 
+import asyncio
+
 import pytak
 
+# uvloop is optional, and speeds up the UDP, TCP & TLS I/O of the event loop:
+try:
+    import uvloop  # type: ignore
+except ImportError:
+    uvloop = None
+
 
 def main() -> None:
     """CLI tool boilerplate."""
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     pytak.cli(__name__.split(".", maxsplit=1)[0])
 
 
@@ -54,6 +54,7 @@ else:
 
 DEFAULT_LISTEN_PORT: int = 5050
 DEFAULT_LISTEN_HOST: str = "0.0.0.0"
+DEFAULT_LISTEN_RCVBUF: int = 12582912  # 12 MiB, absorbs bursts from AIS relays
 
 DEFAULT_COT_STALE: str = "3600"  # 1 hour
 DEFAULT_COT_TYPE: str = "a-u-S-X-M"
@@ -22,8 +22,9 @@
 import xml.etree.ElementTree as ET
 
 from configparser import SectionProxy
-from typing import Optional, Union
-from xml.etree.ElementTree import tostring, Element
+from types import MappingProxyType
+from typing import Dict, List, Optional, Union
+from xml.etree.ElementTree import Element
 
 import pytak
 import aiscot
@@ -55,13 +56,79 @@ def create_tasks(config: Union[dict, SectionProxy], clitool: pytak.CLITool) -> s
     return set([aiscot.AISWorker(clitool.tx_queue, config)])
 
 
+# Shared stand-in for missing config or known_craft, saves allocating a dict per call:
+_EMPTY: MappingProxyType = MappingProxyType({})
+
+# Escapes for XML attribute values & text, matching ElementTree's serializer:
+_ESCAPE_ATTRIB = str.maketrans(
+    {
+        "&": "&amp;",
+        "<": "&lt;",
+        ">": "&gt;",
+        '"': "&quot;",
+        "\r": "&#13;",
+        "\n": "&#10;",
+        "\t": "&#09;",
+    }
+)
+_ESCAPE_TEXT = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# AIS Speed over ground (0.1-knot units) to CoT Speed (meters/second):
+_TENTH_KNOTS_TO_MPS: float = 0.1 / 1.944
+
+# Cursor on Target <event/> template, for use by `ais_to_cot()`:
+COT_TEMPLATE: str = (
+    '<event version="2.0" type="{cot_type}" uid="{uid}" how="m-g" time="{time}" '
+    'start="{start}" stale="{stale}">'
+    '<point lat="{lat}" lon="{lon}" hae="9999999.0" le="9999999.0" ce="9999999.0" />'
+    "<detail>{track}"
+    '<contact callsign="{callsign}" />'
+    "<remarks>{remarks}</remarks>"
+    "{usericon}</detail>"
+    "{aiscot}</event>"
+)
+
+# 'TAK Protocol, Version 0' framing around `COT_TEMPLATE`, so the whole message is
+# encoded to bytes in one go:
+_TAK_PROTO_0_TEMPLATE: str = "\n".join(
+    [pytak.DEFAULT_XML_DECLARATION.decode("UTF-8"), COT_TEMPLATE, ""]
+)
+
+
+# Configuration parameters read by `ais_to_cot_fields()`:
+COT_CONFIG_KEYS: tuple = (
+    "COT_TYPE",
+    "COT_STALE",
+    "COT_HOST_ID",
+    "COT_ICON",
+    "IGNORE_ATON",
+)
+
+
+def cot_config(config: Union[dict, SectionProxy, None]) -> dict:
+    """Snapshot the configuration parameters used for CoT into a plain `dict`.
+
+    Passing the snapshot to `ais_to_cot()` for every message saves the per-lookup
+    interpolation of a ConfigParser `SectionProxy`.
+    """
+    config = config or _EMPTY
+    return {key: config.get(key) for key in COT_CONFIG_KEYS}
+
+
+def _attribs(attribs: dict) -> str:
+    """Render a `dict` as escaped XML attributes."""
+    return "".join(
+        [f' {key}="{val.translate(_ESCAPE_ATTRIB)}"' for key, val in attribs.items()]
+    )
+
+
 # pylint: disable=too-many-locals, too-many-branches, too-many-statements
-def ais_to_cot_xml(
+def ais_to_cot_fields(
     craft: dict,
     config: Union[dict, SectionProxy, None] = None,
     known_craft: Optional[dict] = None,
-) -> Optional[Element]:
-    """Convert AIS sentences to Cursor on Target.
+) -> Optional[dict]:
+    """Convert AIS sentences to the fields of a Cursor on Target Event.
 
     Supports AIS from different sources, including Serial/NMEA and API feeds.
 
@@ -73,26 +140,30 @@ def ais_to_cot_xml(
 
     Returns
     -------
-    A Cursor on Target <event/>.
+    The Cursor on Target <event/> fields, as rendered by `ais_to_cot_xml()` and
+    `ais_to_cot()`.
     """
-    known_craft = known_craft or {}
-    config = config or {}
+    known_craft = known_craft or _EMPTY
+    config = config or _EMPTY
     remarks_fields: list = []
 
+    # At least these three must exist, but may have different names depending on the
+    # AIS source:
+    mmsi: str = str(craft.get("mmsi", craft.get("MMSI", "")))
+    if not mmsi:
+        return None
+
     lat: float = float(
         craft.get("lat", craft.get("LATITUDE", craft.get("latitude", "0")))
     )
     lon: float = float(
         craft.get("lon", craft.get("LONGITUDE", craft.get("longitude", "0")))
     )
-    mmsi: str = str(craft.get("mmsi", craft.get("MMSI", "")))
-
-    # At least these three must exist, but may have different names depending on the
-    # AIS source:
-    if not all([lat, lon, mmsi]):
+    if not (lat and lon):
         return None
 
-    aton: bool = aisfunc.get_aton(mmsi)
+    country, aton, uscg, crs = aisfunc.classify_mmsi(mmsi)
+
     # If IGNORE_ATON is set and this is an Aid to Naviation, we'll ignore it.
     if aton and config.get("IGNORE_ATON"):
         return None
@@ -111,13 +182,15 @@ def ais_to_cot_xml(
 
     cot_host_id: str = str(config.get("COT_HOST_ID") or "")
 
-    aiscotx: Element = Element("_aiscot_")
-    aiscotx.set("cot_host_id", cot_host_id)
+    aiscotx: dict = {"cot_host_id": cot_host_id}
 
     ais_name: str = (
         str(craft.get("name", craft.get("NAME", ""))).replace("@", "").strip()
     )
-    shipname: str = str(craft.get("shipname", aisfunc.get_shipname(mmsi)))
+    # Only look the Ship Name up if the AIS source didn't provide one:
+    shipname: str = str(
+        craft["shipname"] if "shipname" in craft else aisfunc.get_shipname(mmsi)
+    )
     vessel_type: str = str(
         craft.get("type", craft.get("TYPE", craft.get("veselType", "")))
     )
@@ -126,12 +199,12 @@ def ais_to_cot_xml(
 
     if ais_name:
         remarks_fields.append(f"AIS Name: {ais_name}")
-        aiscotx.set("ais_name", ais_name)
+        aiscotx["ais_name"] = ais_name
 
     if shipname:
         ais_name = shipname
         remarks_fields.append(f"Shipname: {shipname}")
-        aiscotx.set("shipname", shipname)
+        aiscotx["shipname"] = shipname
 
     _name = known_craft.get("NAME") or ais_name
     if _name:
@@ -139,79 +212,120 @@ def ais_to_cot_xml(
     else:
         callsign = mmsi
 
-    country: str = aisfunc.get_mid(mmsi)
     if country:
         cot_type = "a-n" + cot_type[3:]
         remarks_fields.append(f"Country: {country}")
-        aiscotx.set("country", country)
-        if "United States of America" in country:
+        aiscotx["country"] = country
+        if country.startswith("United States of America"):
             cot_type = "a-f" + cot_type[3:]
 
     if vessel_type:
         ais_name = shipname
         remarks_fields.append(f"Type: {vessel_type}")
-        aiscotx.set("type", str(vessel_type))
+        aiscotx["type"] = str(vessel_type)
 
     if mmsi:
         remarks_fields.append(f"MMSI: {mmsi}")
-        aiscotx.set("mmsi", str(mmsi))
+        aiscotx["mmsi"] = str(mmsi)
 
-    aiscotx.set("aton", str(aton))
+    aiscotx["aton"] = str(aton)
     if aton:
         cot_type = "a-n-S-N"
         cot_stale = 86400  # 1 Day
         callsign = f"AtoN {callsign}"
         remarks_fields.append(f"AtoN: {aton}")
 
-    uscg: bool = aisfunc.get_sar(mmsi)
-    aiscotx.set("uscg", str(uscg))
+    aiscotx["uscg"] = str(uscg)
     if uscg:
         cot_type = "a-f-S-X-L"
         remarks_fields.append(f"USCG: {uscg}")
 
-    crs: bool = aisfunc.get_crs(mmsi)
-    aiscotx.set("crs", str(crs))
+    aiscotx["crs"] = str(crs)
     if crs:
         cot_type = "a-f-G-I-U-T"
         cot_stale = 86400  # 1 Day
         callsign = f"USCG CRS {callsign}"
         remarks_fields.append(f"USCG CRS: {crs}")
 
-    point = Element("point")
-    point.set("lat", str(lat))
-    point.set("lon", str(lon))
-    point.set("hae", "9999999.0")
-    point.set("le", "9999999.0")
-    point.set("ce", "9999999.0")
-
-    track = Element("track")
+    track: dict = {}
     heading: Optional[float] = craft.get("heading", craft.get("HEADING"))
     if heading:
-        track.set("course", str(heading))
+        track["course"] = str(heading)
 
     # AIS Speed over ground: 0.1-knot (0.19 km/h) resolution from
     #                    0 to 102 knots (189 km/h)
     # COT Speed is meters/second
     sog: Optional[float] = craft.get("speed", craft.get("SPEED", craft.get("SOG", "0")))
     if sog:
-        sog = float(sog) * 0.1 / 1.944
-    if sog and sog != 0.0:
-        track.set("speed", str(sog))
+        sog = float(sog) * _TENTH_KNOTS_TO_MPS
+        if sog:
+            track["speed"] = str(sog)
+
+    remarks_fields.append(f"{cot_host_id}")
+
+    return {
+        "cot_type": cot_type,
+        "uid": uid,
+        "cot_stale": cot_stale,
+        # AIS positions have 1/10000' (~1.7e-6 degree) resolution, so 6 decimals keep
+        # every distinct position, and fixed-point is cheaper than the shortest repr:
+        "lat": format(lat, ".6f"),
+        "lon": format(lon, ".6f"),
+        "track": track,
+        "callsign": str(callsign),
+        "remarks": " ".join(list(filter(None, remarks_fields))),
+        "cot_icon": cot_icon,
+        "aiscot": aiscotx,
+    }
+
+
+def ais_to_cot_xml(
+    craft: dict,
+    config: Union[dict, SectionProxy, None] = None,
+    known_craft: Optional[dict] = None,
+) -> Optional[Element]:
+    """Convert AIS sentences to Cursor on Target.
+
+    Supports AIS from different sources, including Serial/NMEA and API feeds.
+
+    Parameters
+    ----------
+    craft : De-serialized AIS.
+    config : Configuration parameters for AISCOT.
+    known_craft : Transforms for AIS data.
+
+    Returns
+    -------
+    A Cursor on Target <event/>.
+    """
+    fields: Optional[dict] = ais_to_cot_fields(craft, config, known_craft)
+    if not fields:
+        return None
+
+    aiscotx: Element = Element("_aiscot_", fields["aiscot"])
+
+    point = Element("point")
+    point.set("lat", fields["lat"])
+    point.set("lon", fields["lon"])
+    point.set("hae", "9999999.0")
+    point.set("le", "9999999.0")
+    point.set("ce", "9999999.0")
+
+    track = Element("track", fields["track"])
 
     # Contact
     contact = Element("contact")
-    contact.set("callsign", str(callsign))
+    contact.set("callsign", fields["callsign"])
 
     remarks = Element("remarks")
-    remarks_fields.append(f"{cot_host_id}")
-    _remarks = " ".join(list(filter(None, remarks_fields)))
-    remarks.text = _remarks
+    remarks.text = fields["remarks"]
 
     detail = Element("detail")
     detail.append(track)
     detail.append(contact)
     detail.append(remarks)
 
+    cot_icon = fields["cot_icon"]
     if cot_icon:
         usericon = ET.Element("usericon")
         usericon.set("iconsetpath", cot_icon)
@@ -219,12 +333,13 @@ def ais_to_cot_xml(
 
     root = Element("event")
     root.set("version", "2.0")
-    root.set("type", cot_type)
-    root.set("uid", uid)
+    root.set("type", fields["cot_type"])
+    root.set("uid", fields["uid"])
     root.set("how", "m-g")
-    root.set("time", pytak.cot_time())
-    root.set("start", pytak.cot_time())
-    root.set("stale", pytak.cot_time(cot_stale))
+    now: str = pytak.cot_time()
+    root.set("time", now)
+    root.set("start", now)
+    root.set("stale", pytak.cot_time(fields["cot_stale"]))
 
     root.append(point)
     root.append(detail)
@@ -245,8 +360,95 @@ def ais_to_cot(
      2. Newline.
      3. Cursor on Target <event/> Element.
      4. Newline.
+
+    Renders the same <event/> as `ais_to_cot_xml()`, but from `COT_TEMPLATE`
+    rather than by building and serializing an ElementTree.
     """
-    cot: Optional[Element] = ais_to_cot_xml(craft, config, known_craft)
-    return (
-        b"\n".join([pytak.DEFAULT_XML_DECLARATION, tostring(cot), b""]) if cot else None
-    )
+    fields: Optional[dict] = ais_to_cot_fields(craft, config, known_craft)
+    if not fields:
+        return None
+
+    now: str = pytak.cot_time()
+    return _render_cot(fields, now, now, pytak.cot_time(fields["cot_stale"]))
+
+
+def known_craft_key(craft: dict) -> str:
+    """Get the Known Craft index key of an AIS message, its normalized MMSI."""
+    # Feed MMSIs may be padded, and Known Craft index keys are upper-cased:
+    return str(craft.get("mmsi", craft.get("MMSI", ""))).strip().upper()
+
+
+def ais_to_cot_batch(
+    crafts: List[dict],
+    config: Union[dict, SectionProxy, None] = None,
+    known_craft_index: Optional[dict] = None,
+    skip_unknown: bool = False,
+) -> List[bytes]:
+    """Convert many AIS messages to 'TAK Protocol, Version 0' CoT at once.
+
+    For replaying or backfilling AIS logs: the time, start & stale timestamps are
+    computed once per batch (and once per distinct stale period) instead of once per
+    message. Messages that do not produce an <event/> are skipped.
+
+    Parameters
+    ----------
+    crafts : De-serialized AIS messages.
+    config : Configuration parameters for AISCOT.
+    known_craft_index : Known Craft entries keyed by MMSI, see `index_known_craft()`.
+    skip_unknown : Skip messages from craft not in a non-empty `known_craft_index`.
+
+    Returns
+    -------
+    A list of CoT Events, in the order of the AIS messages they came from.
+    """
+    known_craft_index = known_craft_index or _EMPTY
+    # Plain dicts, such as `cot_config()` snapshots, are used as they are:
+    if not isinstance(config, dict):
+        config = cot_config(config)
+    now: str = pytak.cot_time()
+    stales: Dict[int, str] = {}
+    events: List[bytes] = []
+
+    for craft in crafts:
+        # Only make the MMSI key if there's Known Craft to look it up in:
+        known_craft: Optional[dict] = None
+        if known_craft_index:
+            known_craft = known_craft_index.get(known_craft_key(craft))
+            if skip_unknown and not known_craft:
+                continue
+
+        fields: Optional[dict] = ais_to_cot_fields(craft, config, known_craft)
+        if not fields:
+            continue
+
+        cot_stale: int = fields["cot_stale"]
+        stale: Optional[str] = stales.get(cot_stale)
+        if stale is None:
+            stale = stales[cot_stale] = pytak.cot_time(cot_stale)
+
+        events.append(_render_cot(fields, now, now, stale))
+
+    return events
+
+
+def _render_cot(fields: dict, time: str, start: str, stale: str) -> bytes:
+    """Render `ais_to_cot_fields()` output as 'TAK Protocol, Version 0'."""
+    cot_icon = fields["cot_icon"]
+    return _TAK_PROTO_0_TEMPLATE.format(
+        cot_type=fields["cot_type"].translate(_ESCAPE_ATTRIB),
+        uid=fields["uid"].translate(_ESCAPE_ATTRIB),
+        time=time,
+        start=start,
+        stale=stale,
+        lat=fields["lat"],
+        lon=fields["lon"],
+        track=f"<track{_attribs(fields['track'])} />",
+        callsign=fields["callsign"].translate(_ESCAPE_ATTRIB),
+        remarks=fields["remarks"].translate(_ESCAPE_TEXT),
+        usericon=(
+            f'<usericon iconsetpath="{cot_icon.translate(_ESCAPE_ATTRIB)}" />'
+            if cot_icon
+            else ""
+        ),
+        aiscot=f"<_aiscot_{_attribs(fields['aiscot'])} />",
+    ).encode("UTF-8")
@@ -41,9 +41,12 @@ Try with !AIVDO,1,1,,,B00000000868rA6<H7KNswPUoP06,0*6A
 
 Source:: https://github.com/pirpyn/pyAISm
 """
+
 # pylint: skip-file
 # flake8: noqa
 import logging
+from functools import reduce
+from operator import xor
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
@@ -53,16 +56,10 @@ def sign_int(s_bytes):
     # converts signed pack of bytes (as a string) to signed int
     # @param s_bytes (string) : '1001001010010010...'
     # @return (int) : signed integer
-    temp = s_bytes
-    if s_bytes[0] == "1":
-        l = temp.rfind("1")  # find last one
-        temp2 = temp[:l].replace("1", "2")
-        temp2 = temp2.replace("0", "1")
-        temp2 = temp2.replace("2", "0")
-        temp = temp2 + temp[l:]
-        return -int(temp, 2)
-    else:
-        return int(temp, 2)
+    value = int(s_bytes, 2)
+    if s_bytes[0] == "1":  # two's complement: negative if the top bit is set
+        value -= 1 << len(s_bytes)
+    return value
 
 
 def compute_checksum(msg):
@@ -74,9 +71,11 @@ def compute_checksum(msg):
     start = 0
     if msg[0] in ("$", "!"):
         start = 1  # reading after '!' if it exists
-    chcksum = 0
-    for c in msg[start:end]:  # for every char in the ais sentenses (comma included)
-        chcksum = chcksum ^ ord(c)  # compare them with the x-or operator '^'
+    data = msg[start:end]
+    try:  # x-or every char in the ais sentenses (comma included) as ascii bytes
+        chcksum = reduce(xor, data.encode("ascii"), 0)
+    except UnicodeEncodeError:  # not ascii, so a broken sentense; x-or the chars
+        chcksum = reduce(xor, map(ord, data), 0)
     sumHex = "%x" % chcksum  # makes it hexadecimal
     return sumHex.zfill(2).upper()
 
@@ -116,20 +115,28 @@ def get_checksum(msg):
     return msg.split("*")[-1]
 
 
+def decod_armor_char(char):
+    # convert one ASCII char of the payload to its 6-bits representation
+    # doc : http://catb.org/gpsd/AIVDM.html#_aivdm_aivdo_payload_armoring
+    # @param (char) char : 'K'
+    # @return (string) bits : '011011'
+    bits = ord(char) - 48
+    if bits > 40:
+        bits = bits - 8
+    return "{0:b}".format(bits).zfill(6)  # makes it a full 6 bits
+
+
+# lookup table of every ASCII char to its 6-bits representation
+ARMOR_BITS = {chr(i): decod_armor_char(chr(i)) for i in range(128)}
+
+
 def decod_payload(payload):
     # convert the payload from ASCII char to their 6-bits representation for every char
     # doc : http://catb.org/gpsd/AIVDM.html#_aivdm_aivdo_payload_armoring
     # @param (string) payload : '177KQ' up to 82 chars
     # @return (string) data :  '000001000111000111011011100001'
-    data = ""
-    for i in range(len(payload)):
-        char = ord(payload[i]) - 48
-        if char > 40:
-            char = char - 8
-        bit = "{0:b}".format(char)
-        bit = bit.zfill(6)  # makes it a full 6 bits
-        data = data + bit
-    return data
+    get_bits = ARMOR_BITS.get
+    return "".join([get_bits(c) or decod_armor_char(c) for c in payload])
 
 
 def decod_6bits_ascii(bits):
@@ -143,23 +150,198 @@ def decod_6bits_ascii(bits):
     return chr(letter)
 
 
+# lookup table of every 6-bits representation to its ascii char
+SIXBITS_ASCII = {
+    "{0:06b}".format(i): decod_6bits_ascii("{0:06b}".format(i)) for i in range(64)
+}
+
+
 def decod_str(data):
     # decode a string of bits to an ascii one with respect to the 6bits ascii table
     # doc : http://catb.org/gpsd/AIVDM.html#_ais_payload_data_types
     # @param (string) data : a string of bits  '000001000001000001'
     # @return (string) a string of bits : 'AAA'
-    name = ""
-    for k in range(len(data) // 6):
-        letter = decod_6bits_ascii(data[6 * k : 6 * (k + 1)])
-        if letter != "@":
-            name += letter
-    return name.rstrip()
+    get_letter = SIXBITS_ASCII.get
+    letters = []
+    for k in range(0, len(data) - len(data) % 6, 6):
+        bits = data[k : k + 6]
+        letters.append(get_letter(bits) or decod_6bits_ascii(bits))
+    return "".join(letters).replace("@", "").rstrip()
 
 
 def is_auxiliary_craft(mmsi):
     return mmsi // 10000000 == 98
 
 
+def decod_1(data):  # Message types 1,2,3
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["repeat"] = int(data[6:8], 2)
+    ais_data["mmsi"] = int(data[8:38], 2)
+    ais_data["status"] = int(data[38:42], 2)
+    ais_data["turn"] = sign_int(data[42:50])
+    ais_data["speed"] = int(data[50:60], 2)
+    ais_data["accuracy"] = data[60]
+    ais_data["lon"] = sign_int(data[61:89]) / 600000.0
+    ais_data["lat"] = sign_int(data[89:116]) / 600000.0
+    ais_data["course"] = int(data[116:128], 2) * 0.1
+    ais_data["heading"] = int(data[128:137], 2)
+    ais_data["second"] = int(data[137:143], 2)
+    ais_data["maneuver"] = int(data[143:145], 2)
+    ais_data["raim"] = data[148]
+    ais_data["radio"] = int(data[149:168], 2)
+    return ais_data
+
+
+def decod_4(data):
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["repeat"] = int(data[6:8], 2)
+    ais_data["mmsi"] = int(data[8:38], 2)
+    ais_data["year"] = int(data[38:52], 2)
+    ais_data["month"] = int(data[52:56], 2)
+    ais_data["day"] = int(data[56:61], 2)
+    ais_data["hour"] = int(data[61:66], 2)
+    ais_data["minute"] = int(data[66:72], 2)
+    ais_data["second"] = int(data[72:78], 2)
+    ais_data["accuracy"] = data[78]
+    ais_data["lon"] = sign_int(data[79:107]) / 600000.0
+    ais_data["lat"] = sign_int(data[107:134]) / 600000.0
+    ais_data["epfd"] = int(data[134:138], 2)
+    ais_data["raim"] = data[148]
+    ais_data["radio"] = int(data[149:168], 2)
+    return ais_data
+
+
+def decod_5(data):
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["repeat"] = int(data[6:8], 2)
+    ais_data["mmsi"] = int(data[8:38], 2)
+    ais_data["ais_version"] = int(data[38:40], 2)
+    ais_data["imo"] = int(data[40:70], 2)
+    ais_data["callsign"] = decod_str(data[70:112])
+    ais_data["shipname"] = decod_str(data[112:232])
+    ais_data["shiptype"] = int(data[232:240], 2)
+    ais_data["to_bow"] = int(data[240:249], 2)
+    ais_data["to_stern"] = int(data[249:258], 2)
+    ais_data["to_port"] = int(data[258:264], 2)
+    ais_data["to_starboard"] = int(data[264:270], 2)
+    ais_data["epfd"] = int(data[270:274], 2)
+    ais_data["month"] = int(data[274:278], 2)
+    ais_data["day"] = int(data[278:283], 2)
+    ais_data["hour"] = int(data[283:288], 2)
+    ais_data["minute"] = int(data[288:294], 2)
+    ais_data["draught"] = float(int(data[294:302], 2) / 10)
+    ais_data["dte"] = data[302]
+    return ais_data
+
+
+def decod_18(data):
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["repeat"] = int(data[6:8], 2)
+    ais_data["mmsi"] = int(data[8:38], 2)
+    ais_data["speed"] = int(data[46:56], 2)
+    ais_data["accuracy"] = data[56]
+    ais_data["lon"] = sign_int(data[57:85]) / 600000.0
+    ais_data["lat"] = sign_int(data[85:112]) / 600000.0
+    ais_data["course"] = int(data[112:124], 2) * 0.1
+    ais_data["heading"] = int(data[124:133], 2)
+    ais_data["second"] = int(data[133:139], 2)
+    ais_data["regional"] = int(data[139:141], 2)
+    ais_data["cs"] = data[141]
+    ais_data["display"] = data[142]
+    ais_data["dsc"] = data[143]
+    ais_data["band"] = data[144]
+    ais_data["msg22"] = data[145]
+    ais_data["assigned"] = data[146]
+    ais_data["raim"] = data[147]
+    ais_data["radio"] = int(data[148:168], 2)
+    return ais_data
+
+
+def decod_19(data):
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["speed"] = int(data[46:56], 2)
+    ais_data["accuracy"] = data[56]
+    ais_data["lon"] = sign_int(data[57:85]) / 600000.0
+    ais_data["lat"] = sign_int(data[85:112]) / 600000.0
+    ais_data["course"] = int(data[112:124], 2) * 0.1
+    ais_data["heading"] = int(data[124:133], 2)
+    ais_data["second"] = int(data[133:139], 2)
+    ais_data["regional"] = int(data[139:143], 2)
+    ais_data["shipname"] = decod_str(data[143:263])
+    ais_data["to_bow"] = int(data[271:280], 2)
+    ais_data["to_stern"] = int(data[280:288], 2)
+    ais_data["to_port"] = int(data[289:295], 2)
+    ais_data["to_starboard"] = int(data[295:301], 2)
+    ais_data["epfd"] = int(data[301:305], 2)
+    ais_data["raim"] = data[305]
+    ais_data["dte"] = data[306]
+    ais_data["assigned"] = data[307]
+    return ais_data
+
+
+def decod_21(data):
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["repeat"] = int(data[6:8], 2)
+    ais_data["mmsi"] = int(data[8:38], 2)
+    ais_data["aid_type"] = int(data[38:43], 2)
+    ais_data["name"] = decod_str(data[43:163])
+    ais_data["accuracy"] = data[163]
+    ais_data["lon"] = sign_int(data[164:192]) / 600000.0
+    ais_data["lat"] = sign_int(data[192:219]) / 600000.0
+    ais_data["to_bow"] = int(data[219:228], 2)
+    ais_data["to_stern"] = int(data[228:237], 2)
+    ais_data["to_port"] = int(data[237:243], 2)
+    ais_data["to_starboard"] = int(data[243:249], 2)
+    ais_data["epfd"] = int(data[249:253], 2)
+    ais_data["second"] = int(data[253:259], 2)
+    ais_data["off_position"] = data[259]
+    ais_data["regional"] = int(data[260:268], 2)
+    ais_data["raim"] = data[268]
+    ais_data["virtual_aid"] = data[269]
+    ais_data["assigned"] = data[270]
+    ais_data["name_ext"] = decod_str(data[272:361])
+    return ais_data
+
+
+def decod_24(data):
+    ais_data = {"type": int(data[0:6], 2)}
+    ais_data["repeat"] = int(data[6:8], 2)
+    ais_data["mmsi"] = int(data[8:38], 2)
+    ais_data["partno"] = int(data[38:40], 2)
+    if not (ais_data["partno"]):
+        ais_data["shipname"] = decod_str(data[40:160])
+    else:
+        ais_data["shiptype"] = int(data[40:48], 2)
+        ais_data["vendorid"] = int(data[48:66], 2)
+        ais_data["vendorname"] = decod_str(
+            data[48:90]
+        )  # Older models. might be garbage
+        ais_data["model"] = int(data[66:70], 2)
+        ais_data["serial"] = int(data[70:90], 2)
+        ais_data["callsign"] = decod_str(data[90:132])
+        if not (is_auxiliary_craft(ais_data["mmsi"])):
+            ais_data["to_bow"] = int(data[132:141], 2)
+            ais_data["to_stern"] = int(data[141:150], 2)
+            ais_data["to_port"] = int(data[150:156], 2)
+            ais_data["to_starboard"] = int(data[156:162], 2)
+        else:
+            ais_data["mothership_mmsi"] = int(data[132:162], 2)
+    return ais_data
+
+
+decod_type = {  # list of the ais message type we can decode
+    1: decod_1,
+    2: decod_1,
+    3: decod_1,
+    4: decod_4,
+    5: decod_5,
+    18: decod_18,
+    19: decod_19,
+    21: decod_21,
+    24: decod_24,
+}
+
+
 def decod_data(data):
     # decode AIS payload and return a dictionary with key:value
     # doc : https://gpsd.gitlab.io/gpsd/AIVDM.html
@@ -167,166 +349,6 @@ def decod_data(data):
     # @return (dict) ais_data : {'type':18, etc...}
     type_nb = int(data[0:6], 2)
 
-    def decod_1(data):  # Message types 1,2,3
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["repeat"] = int(data[6:8], 2)
-        ais_data["mmsi"] = int(data[8:38], 2)
-        ais_data["status"] = int(data[38:42], 2)
-        ais_data["turn"] = sign_int(data[42:50])
-        ais_data["speed"] = int(data[50:60], 2)
-        ais_data["accuracy"] = data[60]
-        ais_data["lon"] = sign_int(data[61:89]) / 600000.0
-        ais_data["lat"] = sign_int(data[89:116]) / 600000.0
-        ais_data["course"] = int(data[116:128], 2) * 0.1
-        ais_data["heading"] = int(data[128:137], 2)
-        ais_data["second"] = int(data[137:143], 2)
-        ais_data["maneuver"] = int(data[143:145], 2)
-        ais_data["raim"] = data[148]
-        ais_data["radio"] = int(data[149:168], 2)
-        return ais_data
-
-    def decod_4(data):
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["repeat"] = int(data[6:8], 2)
-        ais_data["mmsi"] = int(data[8:38], 2)
-        ais_data["year"] = int(data[38:52], 2)
-        ais_data["month"] = int(data[52:56], 2)
-        ais_data["day"] = int(data[56:61], 2)
-        ais_data["hour"] = int(data[61:66], 2)
-        ais_data["minute"] = int(data[66:72], 2)
-        ais_data["second"] = int(data[72:78], 2)
-        ais_data["accuracy"] = data[78]
-        ais_data["lon"] = sign_int(data[79:107]) / 600000.0
-        ais_data["lat"] = sign_int(data[107:134]) / 600000.0
-        ais_data["epfd"] = int(data[134:138], 2)
-        ais_data["raim"] = data[148]
-        ais_data["radio"] = int(data[149:168], 2)
-        return ais_data
-
-    def decod_5(data):
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["repeat"] = int(data[6:8], 2)
-        ais_data["mmsi"] = int(data[8:38], 2)
-        ais_data["ais_version"] = int(data[38:40], 2)
-        ais_data["imo"] = int(data[40:70], 2)
-        ais_data["callsign"] = decod_str(data[70:112])
-        ais_data["shipname"] = decod_str(data[112:232])
-        ais_data["shiptype"] = int(data[232:240], 2)
-        ais_data["to_bow"] = int(data[240:249], 2)
-        ais_data["to_stern"] = int(data[249:258], 2)
-        ais_data["to_port"] = int(data[258:264], 2)
-        ais_data["to_starboard"] = int(data[264:270], 2)
-        ais_data["epfd"] = int(data[270:274], 2)
-        ais_data["month"] = int(data[274:278], 2)
-        ais_data["day"] = int(data[278:283], 2)
-        ais_data["hour"] = int(data[283:288], 2)
-        ais_data["minute"] = int(data[288:294], 2)
-        ais_data["draught"] = float(int(data[294:302], 2) / 10)
-        ais_data["dte"] = data[302]
-        return ais_data
-
-    def decod_18(data):
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["repeat"] = int(data[6:8], 2)
-        ais_data["mmsi"] = int(data[8:38], 2)
-        ais_data["speed"] = int(data[46:56], 2)
-        ais_data["accuracy"] = data[56]
-        ais_data["lon"] = sign_int(data[57:85]) / 600000.0
-        ais_data["lat"] = sign_int(data[85:112]) / 600000.0
-        ais_data["course"] = int(data[112:124], 2) * 0.1
-        ais_data["heading"] = int(data[124:133], 2)
-        ais_data["second"] = int(data[133:139], 2)
-        ais_data["regional"] = int(data[139:141], 2)
-        ais_data["cs"] = data[141]
-        ais_data["display"] = data[142]
-        ais_data["dsc"] = data[143]
-        ais_data["band"] = data[144]
-        ais_data["msg22"] = data[145]
-        ais_data["assigned"] = data[146]
-        ais_data["raim"] = data[147]
-        ais_data["radio"] = int(data[148:168], 2)
-        return ais_data
-
-    def decod_19(data):
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["speed"] = int(data[46:56], 2)
-        ais_data["accuracy"] = data[56]
-        ais_data["lon"] = sign_int(data[57:85]) / 600000.0
-        ais_data["lat"] = sign_int(data[85:112]) / 600000.0
-        ais_data["course"] = int(data[112:124], 2) * 0.1
-        ais_data["heading"] = int(data[124:133], 2)
-        ais_data["second"] = int(data[133:139], 2)
-        ais_data["regional"] = int(data[139:143], 2)
-        ais_data["shipname"] = decod_str(data[143:263])
-        ais_data["to_bow"] = int(data[271:280], 2)
-        ais_data["to_stern"] = int(data[280:288], 2)
-        ais_data["to_port"] = int(data[289:295], 2)
-        ais_data["to_starboard"] = int(data[295:301], 2)
-        ais_data["epfd"] = int(data[301:305], 2)
-        ais_data["raim"] = data[305]
-        ais_data["dte"] = data[306]
-        ais_data["assigned"] = data[307]
-        return ais_data
-
-    def decod_21(data):
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["repeat"] = int(data[6:8], 2)
-        ais_data["mmsi"] = int(data[8:38], 2)
-        ais_data["aid_type"] = int(data[38:43], 2)
-        ais_data["name"] = decod_str(data[43:163])
-        ais_data["accuracy"] = data[163]
-        ais_data["lon"] = sign_int(data[164:192]) / 600000.0
-        ais_data["lat"] = sign_int(data[192:219]) / 600000.0
-        ais_data["to_bow"] = int(data[219:228], 2)
-        ais_data["to_stern"] = int(data[228:237], 2)
-        ais_data["to_port"] = int(data[237:243], 2)
-        ais_data["to_starboard"] = int(data[243:249], 2)
-        ais_data["epfd"] = int(data[249:253], 2)
-        ais_data["second"] = int(data[253:259], 2)
-        ais_data["off_position"] = data[259]
-        ais_data["regional"] = int(data[260:268], 2)
-        ais_data["raim"] = data[268]
-        ais_data["virtual_aid"] = data[269]
-        ais_data["assigned"] = data[270]
-        ais_data["name_ext"] = decod_str(data[272:361])
-        return ais_data
-
-    def decod_24(data):
-        ais_data = {"type": int(data[0:6], 2)}
-        ais_data["repeat"] = int(data[6:8], 2)
-        ais_data["mmsi"] = int(data[8:38], 2)
-        ais_data["partno"] = int(data[38:40], 2)
-        if not (ais_data["partno"]):
-            ais_data["shipname"] = decod_str(data[40:160])
-        else:
-            ais_data["shiptype"] = int(data[40:48], 2)
-            ais_data["vendorid"] = int(data[48:66], 2)
-            ais_data["vendorname"] = decod_str(
-                data[48:90]
-            )  # Older models. might be garbage
-            ais_data["model"] = int(data[66:70], 2)
-            ais_data["serial"] = int(data[70:90], 2)
-            ais_data["callsign"] = decod_str(data[90:132])
-            if not (is_auxiliary_craft(ais_data["mmsi"])):
-                ais_data["to_bow"] = int(data[132:141], 2)
-                ais_data["to_stern"] = int(data[141:150], 2)
-                ais_data["to_port"] = int(data[150:156], 2)
-                ais_data["to_starboard"] = int(data[156:162], 2)
-            else:
-                ais_data["mothership_mmsi"] = int(data[132:162], 2)
-        return ais_data
-
-    decod_type = {  # list of the ais message type we can decode
-        1: decod_1,
-        2: decod_1,
-        3: decod_1,
-        4: decod_4,
-        5: decod_5,
-        18: decod_18,
-        19: decod_19,
-        21: decod_21,
-        24: decod_24,
-    }
     try:
         ais_data = decod_type[type_nb](
             data
@@ -354,17 +376,19 @@ def decod_ais(msg):
     """
     if msg == "":
         return None
-    message_type = get_msg_type(msg)
+    fields = msg.split(",")  # split the sentense once, rather than per field
+    message_type = fields[0]
     if not (message_type == "!AIVDM" or message_type == "!AIVDO"):
         raise UnrecognizedNMEAMessageError(message_type)
-    payload = get_payload(msg)
-    s_size = get_sentence_number(msg)
-    s_count = get_sentence_count(msg)
+    payload = fields[5]
+    s_size = fields[1]
+    s_count = fields[2]
 
-    if compute_checksum(msg) != get_checksum(msg):
+    checksum = compute_checksum(msg)
+    if checksum != get_checksum(msg):
         logger.error(
             "Checksum not valid ("
-            + str(compute_checksum(msg))
+            + str(checksum)
             + "!="
             + str(get_checksum(msg))
             + "), message is broken/corrupted"
@@ -18,20 +18,26 @@
 
 """AISCOT AIS Function Tests."""
 
+import os
+
 import pytest
 
 from aiscot.constants import DEFAULT_MID_DB_FILE, DEFAULT_SHIP_DB_FILE
 
 from aiscot.ais_functions import (
+    classify_mmsi,
     get_aton,
     get_mid,
     get_known_craft,
     get_sar,
+    index_known_craft,
+    load_known_craft,
+    read_ship_db_file,
+    read_ship_db_index,
     get_crs,
     get_shipname,
 )
 
-
 __author__ = "Greg Albrecht <oss@undef.net>"
 __copyright__ = "Copyright 2023 Greg Albrecht"
 __license__ = "Apache License, Version 2.0"
@@ -123,6 +129,8 @@ def test_get_mid(sample_data_pyAISm):
     mmsi = sample_data_pyAISm.get("mmsi")
     country = get_mid(mmsi)
     assert country == "United States of America"
+    assert get_mid(str(mmsi)) == "United States of America"
+    assert get_mid("111366000") is None
 
 
 def test_get_known_craft():
@@ -131,10 +139,39 @@ def test_get_known_craft():
     assert known_craft[0].get("MMSI") == "366892000"
 
 
+def test_index_known_craft():
+    """Test indexing Known Craft by MMSI with `index_known_craft()`."""
+    known_craft = [
+        {"MMSI": " 366892000 ", "NAME": "TACO_01"},
+        {"MMSI": "366892000", "NAME": "TACO_02"},
+        {"MMSI": "", "NAME": "NO_MMSI"},
+        {"MMSI": "a1b2", "NAME": "ALPHA"},
+    ]
+    index = index_known_craft(known_craft)
+    assert index["366892000"]["NAME"] == "TACO_01"
+    assert index["A1B2"]["NAME"] == "ALPHA"
+    assert len(index) == 2
+
+
+def test_load_known_craft(tmp_path):
+    """Test reading & reusing Known Craft with `load_known_craft()`."""
+    csv_file = tmp_path / "known_craft.csv"
+    csv_file.write_text("MMSI,NAME\n366892000,TACO_01\n")
+    known_craft_db, known_craft_index = load_known_craft(str(csv_file))
+    assert known_craft_index["366892000"]["NAME"] == "TACO_01"
+    assert load_known_craft(str(csv_file))[0] is known_craft_db
+
+    csv_file.write_text("MMSI,NAME\n366892000,TACO_02\n")
+    os.utime(csv_file, ns=(0, 0))
+    assert load_known_craft(str(csv_file))[1]["366892000"]["NAME"] == "TACO_02"
+
+
 def test_get_aton(sample_aton):
     """Test Aid to Naviation vessels with `get_aton()`."""
     mmsi = sample_aton.get("mmsi")
     assert get_aton(mmsi) is True
+    assert get_aton(str(mmsi)) is True
+    assert get_aton(366892000) is False
 
 
 def test_get_crs():
@@ -142,6 +179,9 @@ def test_get_crs():
     assert get_crs("3669123") is True
     assert get_crs("003369000") is True
     assert get_crs("938852000") is False
+    assert get_crs(3669123) is True
+    assert get_crs(3369000) is True
+    assert get_crs(938852000) is False
 
 
 def test_get_sar():
@@ -150,9 +190,53 @@ def test_get_sar():
     assert get_sar("303862000") is True
     assert get_sar("338852000") is True
     assert get_sar("938852000") is False
+    assert get_sar(111892000) is True
+    assert get_sar(303862000) is True
+    assert get_sar(938852000) is False
+
+
+def test_classify_mmsi():
+    """Test classifying MMSIs with `classify_mmsi()`."""
+    assert classify_mmsi("366892000") == (
+        "United States of America",
+        False,
+        False,
+        False,
+    )
+    assert classify_mmsi(993692016) == (None, True, False, False)
+    assert classify_mmsi("303862000")[2] is True
+    assert classify_mmsi("3669123")[3] is True
+    assert classify_mmsi("") == (None, False, False, False)
 
 
 def test_get_shipname():
     """Test getting shipname from db using `get_shipname()`."""
     assert get_shipname("303990000") == "USCG EAGLE"
     assert get_shipname("938852000") == ""
+    assert get_shipname("211824000") == "DESTINY BRA4"
+    assert get_shipname(303990000) == "USCG EAGLE"
+    assert get_shipname("0303990000") == ""
+
+
+def test_read_ship_db_index():
+    """Test indexing the Ship DB with `read_ship_db_index()`."""
+    ship_db, mmsis, offsets = read_ship_db_index(DEFAULT_SHIP_DB_FILE)
+    assert len(mmsis) == len(offsets)
+    assert list(mmsis) == sorted(mmsis)
+    assert ship_db[offsets[0] :].startswith(str(mmsis[0]).encode())
+
+
+def test_read_ship_db_file(tmp_path):
+    """Test that `read_ship_db_file()` keeps the same entries as `get_shipname()`."""
+    csv_file = tmp_path / "ships.txt"
+    csv_file.write_text(
+        "303990000,USCG EAGLE,NRCB,\n"
+        "303990000,DUPLICATE,,\n"
+        "BADMMSI,NOT A SHIP,,\n"
+        "211824000,DESTINY BRA4,,\n",
+        encoding="ISO-8859-1",
+    )
+    assert read_ship_db_file(str(csv_file)) == {
+        "211824000": "DESTINY BRA4",
+        "303990000": "USCG EAGLE",
+    }
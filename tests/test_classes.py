@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Greg Albrecht <oss@undef.net>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""AISCOT Class Tests."""
+
+import asyncio
+import gc
+import socket
+import sys
+import warnings
+import xml.etree.ElementTree as ET
+
+from configparser import ConfigParser
+
+import aiohttp
+import pytest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import aiscot
+import aiscot.classes
+
+__author__ = "Greg Albrecht <oss@undef.net>"
+__copyright__ = "Copyright 2023 Greg Albrecht"
+__license__ = "Apache License, Version 2.0"
+
+
+@pytest.fixture
+def config():
+    """Get an AISCOT config section with defaults."""
+    parser = ConfigParser()
+    parser["aiscot"] = {"COT_URL": "udp://127.0.0.1:8087"}
+    return parser["aiscot"]
+
+
+class RefusingSocket:
+    """Socket stand-in that refuses receive buffer sizes, as macOS & BSD do."""
+
+    def setsockopt(self, *args):
+        raise OSError(55, "No buffer space available")
+
+
+def test_set_rcvbuf_refused(config, caplog):
+    """Test that a refused LISTEN_RCVBUF is logged, rather than raised."""
+    worker = aiscot.AISWorker(asyncio.Queue(), config)
+    worker.set_rcvbuf(RefusingSocket(), aiscot.DEFAULT_LISTEN_RCVBUF)
+    assert "Unable to set LISTEN_RCVBUF" in caplog.text
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test_set_rcvbuf_capped(config, caplog):
+    """Test that a LISTEN_RCVBUF capped by net.core.rmem_max is logged."""
+    with open("/proc/sys/net/core/rmem_max", encoding="ascii") as rmem_max_fd:
+        rmem_max = int(rmem_max_fd.read())
+    worker = aiscot.AISWorker(asyncio.Queue(), config)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        worker.set_rcvbuf(sock, rmem_max + 4096)
+    assert f"capped to {rmem_max} bytes" in caplog.text
+
+
+# Two single-sentence AIS position reports, from MMSIs 211433000 & 477553000:
+AIS_DATAGRAM = (
+    b"!AIVDM,1,1,,B,139`n:0P0;o>Qm@EUc838wvj2<25,0*4E\r\n"
+    b"!AIVDM,1,1,,B,177KQJ5000G?tO`K>RA1wUbN0TKH,0*5C\n"
+)
+
+
+def free_udp_port() -> int:
+    """Get a UDP port on the loopback that's free to listen on."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_listen_socket_closed_on_error(config):
+    """Test that `listen_socket()` closes its socket if it can't bind."""
+    worker = aiscot.AISWorker(asyncio.Queue(), config)
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as in_use:
+        in_use.bind(("127.0.0.1", 0))
+        port = in_use.getsockname()[1]
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            try:
+                worker.listen_socket("127.0.0.1", port, False)
+            except OSError:
+                pass
+            else:
+                pytest.fail("Bound to a port already in use.")
+            gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("add_reader", [True, False])
+async def test_network_rx(config, monkeypatch, add_reader):
+    """Test receiving a multi-sentence AIS datagram over the loopback."""
+    if not add_reader:
+        # Like Windows' Proactor, which falls back to a datagram endpoint:
+        def no_add_reader(*args):
+            raise NotImplementedError
+
+        monkeypatch.setattr(asyncio.get_running_loop(), "add_reader", no_add_reader)
+
+    port = free_udp_port()
+    config["LISTEN_HOST"] = "127.0.0.1"
+    config["LISTEN_PORT"] = str(port)
+    queue: asyncio.Queue = asyncio.Queue()
+    worker = aiscot.AISWorker(queue, config)
+    task = asyncio.ensure_future(worker.network_rx())
+    try:
+        await asyncio.sleep(0.1)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(AIS_DATAGRAM, ("127.0.0.1", port))
+        events = [await asyncio.wait_for(queue.get(), 1) for _ in range(2)]
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert b'uid="MMSI-211433000"' in events[0]
+    assert b'uid="MMSI-477553000"' in events[1]
+    assert queue.empty()
+
+
+def test_handle_messages_skips_bad_sentences(config):
+    """Test that a malformed sentence is skipped without dropping the rest."""
+    queue: asyncio.Queue = asyncio.Queue()
+    client = aiscot.classes.AISNetworkClient(asyncio.Event(), queue, config)
+    client.handle_messages(
+        [
+            # Bad checksum:
+            "!AIVDM,1,1,,B,139`n:0P0;o>Qm@EUc838wvj2<25,0*4F",
+            # Truncated, with a valid checksum:
+            "!AIVDM,1,1,,B,139`n:0P0,0*7A",
+            "!AIVDM,1,1,,B,177KQJ5000G?tO`K>RA1wUbN0TKH,0*5C",
+        ]
+    )
+    assert queue.qsize() == 1
+    assert b'uid="MMSI-477553000"' in queue.get_nowait()
+
+
+@pytest.mark.asyncio
+async def test_get_feed_conditional(config):
+    """Test the conditional GETs & 304 replay of `AISWorker.get_feed()`."""
+    requests: list = []
+    responses: list = [
+        web.json_response(
+            [
+                {"ERROR": False},
+                [{"MMSI": 366892000, "LATITUDE": 37.8, "LONGITUDE": -122.5}],
+            ],
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 12 Oct 2026 00:00:00 GMT"},
+        ),
+        web.Response(status=304),
+        web.json_response([{"ERROR": True, "ERROR_MESSAGE": "Too frequent requests"}]),
+    ]
+
+    async def handler(request):
+        requests.append(request.headers)
+        return responses[len(requests) - 1]
+
+    app = web.Application()
+    app.router.add_get("/feed", handler)
+    queue: asyncio.Queue = asyncio.Queue()
+    worker = aiscot.AISWorker(queue, config)
+
+    async with TestServer(app) as server:
+        worker.feed_url = str(server.make_url("/feed"))
+        async with aiohttp.ClientSession(raise_for_status=True) as worker.session:
+            await worker.get_feed()
+            assert "If-None-Match" not in requests[0]
+            assert queue.qsize() == 1
+            first_event = queue.get_nowait()
+
+            # Unchanged, so the last poll's ships are sent again:
+            await worker.get_feed()
+            assert requests[1]["If-None-Match"] == '"v1"'
+            assert requests[1]["If-Modified-Since"] == "Mon, 12 Oct 2026 00:00:00 GMT"
+            assert queue.qsize() == 1
+            assert b'uid="MMSI-366892000"' in queue.get_nowait()
+            assert b'uid="MMSI-366892000"' in first_event
+
+            # An error report invalidates the validators:
+            await worker.get_feed()
+            assert worker._feed_validators == {}  # pylint: disable=protected-access
+            assert queue.empty()
+
+
+def test_handle_messages_batch_time(config):
+    """Test that a batch of AIS sentences shares one CoT timestamp."""
+    queue: asyncio.Queue = asyncio.Queue()
+    client = aiscot.classes.AISNetworkClient(asyncio.Event(), queue, config)
+    client.handle_messages(AIS_DATAGRAM.decode().splitlines())
+    times = {
+        ET.fromstring(queue.get_nowait().split(b"\n", 1)[1]).get("time")
+        for _ in range(2)
+    }
+    assert len(times) == 1
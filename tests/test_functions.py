@@ -19,14 +19,21 @@
 """AISCOT Function Tests."""
 
 import io
+
+from configparser import ConfigParser
 import xml.etree.ElementTree as ET
 
 import pytest
 
-from aiscot.ais_functions import read_known_craft_fd
+from aiscot.ais_functions import index_known_craft, read_known_craft_fd
 from aiscot.constants import DEFAULT_MID_DB_FILE, DEFAULT_SHIP_DB_FILE
-from aiscot.functions import ais_to_cot, ais_to_cot_xml
-
+from aiscot.functions import (
+    ais_to_cot,
+    ais_to_cot_batch,
+    ais_to_cot_xml,
+    cot_config,
+    known_craft_key,
+)
 
 __author__ = "Greg Albrecht <oss@undef.net>"
 __copyright__ = "Copyright 2023 Greg Albrecht"
@@ -130,11 +137,12 @@ def test_ais_to_cot_xml(sample_data_pyAISm):
     assert cot.attrib["version"] == "2.0"
     assert cot.attrib["type"] == "a-f-S-X-M"
     assert cot.attrib["uid"] == "MMSI-366892000"
+    assert cot.attrib["time"] == cot.attrib["start"]
 
     point = cot.findall("point")
     assert point[0].tag == "point"
-    assert point[0].attrib["lat"] == "37.81691333333333"
-    assert point[0].attrib["lon"] == "-122.51208"
+    assert point[0].attrib["lat"] == "37.816913"
+    assert point[0].attrib["lon"] == "-122.512080"
     assert point[0].attrib["hae"] == "9999999.0"
 
     detail = cot.findall("detail")
@@ -169,8 +177,8 @@ def test_ais_to_cot_xml_with_known_craft(sample_data_pyAISm, sample_known_craft)
 
     point = cot.findall("point")
     assert point[0].tag == "point"
-    assert point[0].attrib["lat"] == "37.81691333333333"
-    assert point[0].attrib["lon"] == "-122.51208"
+    assert point[0].attrib["lat"] == "37.816913"
+    assert point[0].attrib["lon"] == "-122.512080"
     assert point[0].attrib["hae"] == "9999999.0"
 
     detail = cot.findall("detail")
@@ -265,3 +273,63 @@ def test_ais_to_cot(sample_data_pyAISm):
     cot: bytes = ais_to_cot(sample_data_pyAISm)
     assert b"a-f-S-X-M" in cot
     assert b"MMSI-366892000" in cot
+
+
+def test_ais_to_cot_matches_ais_to_cot_xml(sample_data_pyAISm, sample_known_craft):
+    """Test that `ais_to_cot()` renders the same <event/> as `ais_to_cot_xml()`."""
+    config = {"COT_ICON": 'icon&"set"', "COT_HOST_ID": "<host>"}
+    sample_data_pyAISm["name"] = "A&B <C>"
+
+    cot = ET.fromstring(
+        ais_to_cot(sample_data_pyAISm, config, sample_known_craft[0]).split(b"\n")[1]
+    )
+    cot_xml = ais_to_cot_xml(sample_data_pyAISm, config, sample_known_craft[0])
+
+    for attrib in ["time", "start", "stale"]:
+        cot.attrib.pop(attrib)
+        cot_xml.attrib.pop(attrib)
+    assert ET.tostring(cot) == ET.tostring(cot_xml)
+
+
+def test_ais_to_cot_batch(sample_data_pyAISm, sample_aton, sample_known_craft):
+    """Test converting a batch of AIS to CoT."""
+    cots = ais_to_cot_batch(
+        [sample_data_pyAISm, {}, sample_aton],
+        known_craft_index=index_known_craft(sample_known_craft),
+    )
+    assert len(cots) == 2
+    assert b"a-f-S-T-A-C-O" in cots[0]
+    assert b'callsign="TACO_01"' in cots[0]
+    assert b"a-n-S-N" in cots[1]
+
+
+def test_ais_to_cot_batch_skip_unknown(
+    sample_data_pyAISm, sample_aton, sample_known_craft
+):
+    """Test skipping craft that aren't Known Craft when converting a batch."""
+    cots = ais_to_cot_batch(
+        [sample_aton, dict(sample_data_pyAISm, MMSI=" 1 ")],
+        known_craft_index=index_known_craft(sample_known_craft),
+        skip_unknown=True,
+    )
+    assert len(cots) == 1
+    assert b'callsign="TACO_01"' in cots[0]
+
+
+def test_known_craft_key():
+    """Test that `known_craft_key()` normalizes the MMSI of either key."""
+    assert known_craft_key({"mmsi": 366892000}) == "366892000"
+    assert known_craft_key({"MMSI": " 366892000 "}) == "366892000"
+    assert known_craft_key({"mmsi": 366892000, "MMSI": 1}) == "366892000"
+    assert known_craft_key({}) == ""
+
+
+def test_cot_config(sample_data_pyAISm):
+    """Test snapshotting the CoT configuration with `cot_config()`."""
+    parser = ConfigParser()
+    parser["aiscot"] = {"COT_HOST_ID": "hostx", "COT_URL": "udp://%(host)s:4242"}
+    config = cot_config(parser["aiscot"])
+    assert type(config) is dict
+    assert config["COT_HOST_ID"] == "hostx"
+    assert "COT_URL" not in config
+    assert b'cot_host_id="hostx"' in ais_to_cot(sample_data_pyAISm, config)